@@ -9,7 +9,7 @@ from typing import Optional, List
 
 from aws_inventory.auth import create_session, validate_credentials, get_account_alias
 from aws_inventory.collector import collect_all, get_available_services, validate_services
-from aws_inventory.formatter import format_output, export_file
+from aws_inventory.formatter import write_output
 
 
 def print_progress(service: str, status: str) -> None:
@@ -30,6 +30,7 @@ def print_progress(service: str, status: str) -> None:
 @click.option('--timings', is_flag=True, help='Show timing summary per service')
 @click.option('--include-global', is_flag=True, help='Include global services even when filtering by non-global regions')
 @click.option('--exclude-defaults', is_flag=True, help='Exclude default AWS resources (default VPCs, security groups, etc.)')
+@click.option('--no-detail-search', is_flag=True, help="Leave resource details out of the HTML report's search (smaller report)")
 def main(
     profile: Optional[str],
     region: tuple,
@@ -42,7 +43,8 @@ def main(
     quiet: bool,
     timings: bool,
     include_global: bool,
-    exclude_defaults: bool
+    exclude_defaults: bool,
+    no_detail_search: bool
 ) -> None:
     """
     awsmap - Map and inventory AWS resources.
@@ -189,27 +191,25 @@ def main(
         click.echo(f"  Regions scanned: {result['metadata']['regions_scanned']}")
         click.echo(f"  Duration: {elapsed:.1f}s")
 
-    # Format output
-    try:
-        output_content = format_output(result, output_format)
-    except Exception as e:
-        click.echo(f"Error formatting output: {e}", err=True)
-        sys.exit(1)
-
     # Determine output file path
     if not output_file:
         timestamp = time.strftime('%Y%m%d_%H%M%S')
         ext = output_format
         output_file = f"{account_id}_inventory_{timestamp}.{ext}"
 
-    # Write output
+    # Format and write output (an existing file is only replaced on success)
     try:
-        export_file(output_content, output_file)
-        if not quiet:
-            click.echo(f"\nOutput saved to: {output_file}")
-    except Exception as e:
+        write_output(result, output_format, output_file,
+                     include_detail_search=not no_detail_search)
+    except OSError as e:
         click.echo(f"Error writing output: {e}", err=True)
         sys.exit(1)
+    except Exception as e:
+        click.echo(f"Error formatting output: {e}", err=True)
+        sys.exit(1)
+
+    if not quiet:
+        click.echo(f"\nOutput saved to: {output_file}")
 
 
 if __name__ == '__main__':
@@ -2,10 +2,60 @@
 Output formatters for inventory results - JSON, CSV, HTML.
 """
 
+import base64
 import json
-import csv
 import io
-from typing import Dict, Any, List
+import os
+import shutil
+import stat
+import sys
+import tempfile
+from collections import Counter, defaultdict
+from contextlib import contextmanager, suppress
+from typing import Dict, Any, Callable, Iterator, List, Optional, TextIO, Tuple
+
+# Optional faster JSON encoder; json stays imported as the fallback. csv is
+# imported lazily by the CSV formatters, so JSON runs never load it; HTML
+# runs do, for the CSV export embedded in the report.
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+def _json_dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> str:
+    """
+    Serialize an object to JSON, using orjson when it is installed.
+
+    Both paths use compact separators unless indenting, leave non-ASCII
+    unescaped and render non-JSON types (datetimes, etc.) with str(). The
+    output is not byte-identical, though: some floats are spelled
+    differently (orjson 1e16 / 0.00001, stdlib 1e+16 / 1e-05), and orjson
+    writes NaN/Infinity as null.
+
+    Args:
+        obj: Object to serialize
+        indent: Pretty-print with a two-space indent
+        sort_keys: Sort dict keys for stable output
+
+    Returns:
+        JSON string
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=str, option=option).decode('utf-8')
+        except TypeError:
+            # e.g. integers beyond 64 bits - let the stdlib encoder handle it
+            pass
+    return json.dumps(
+        obj, indent=2 if indent else None, separators=None if indent else (',', ':'),
+        sort_keys=sort_keys, ensure_ascii=False, default=str,
+    )
 
 
 def format_json(data: Dict[str, Any]) -> str:
@@ -18,254 +68,138 @@ def format_json(data: Dict[str, Any]) -> str:
     Returns:
         JSON string
     """
-    return json.dumps(data, indent=2, default=str)
+    return _json_dumps(data, indent=True)
 
 
-def format_csv(data: Dict[str, Any]) -> str:
+_CSV_FIELDS = ('service', 'type', 'id', 'name', 'region', 'arn', 'is_default', 'tags')
+
+
+def _csv_rows(resources: List[Dict[str, Any]]) -> Iterator[tuple]:
+    """Yield one positional CSV row per resource (header row first)."""
+    yield _CSV_FIELDS
+
+    for resource in resources:
+        g = resource.get
+        tags = g('tags', {})
+        tags_str = '; '.join(f"{k}={v}" for k, v in tags.items()) if tags else ''
+
+        yield (
+            g('service', ''), g('type', ''), g('id', ''), g('name', ''),
+            g('region', ''), g('arn', ''), g('is_default', False), tags_str,
+        )
+
+
+def iter_format_csv(data: Dict[str, Any]) -> Iterator[str]:
     """
-    Format inventory data as CSV.
+    Format inventory data as CSV, one row at a time.
 
     Args:
         data: Inventory data with metadata and resources
 
-    Returns:
-        CSV string
+    Yields:
+        CSV text chunks, starting with the header row
     """
+    import csv
+
     resources = data.get('resources', [])
 
     if not resources:
-        return "service,type,id,name,region,arn,is_default,tags\n"
-
-    output = io.StringIO()
-    fieldnames = ['service', 'type', 'id', 'name', 'region', 'arn', 'is_default', 'tags']
-    writer = csv.DictWriter(output, fieldnames=fieldnames, extrasaction='ignore')
-    writer.writeheader()
-
-    for resource in resources:
-        tags = resource.get('tags', {})
-        tags_str = '; '.join(f"{k}={v}" for k, v in tags.items()) if tags else ''
+        yield ','.join(_CSV_FIELDS) + '\n'
+        return
 
-        writer.writerow({
-            'service': resource.get('service', ''),
-            'type': resource.get('type', ''),
-            'id': resource.get('id', ''),
-            'name': resource.get('name', ''),
-            'region': resource.get('region', ''),
-            'arn': resource.get('arn', ''),
-            'is_default': resource.get('is_default', False),
-            'tags': tags_str
-        })
+    buf = io.StringIO()
+    writer = csv.writer(buf)
 
-    return output.getvalue()
+    for row in _csv_rows(resources):
+        writer.writerow(row)
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate(0)
 
 
-def format_html(data: Dict[str, Any]) -> str:
+def format_csv(data: Dict[str, Any]) -> str:
     """
-    Format inventory data as beautiful HTML report.
+    Format inventory data as CSV.
 
     Args:
         data: Inventory data with metadata and resources
 
     Returns:
-        HTML string
+        CSV string
     """
-    resources = data.get('resources', [])
-    metadata = data.get('metadata', {})
+    return ''.join(iter_format_csv(data))
 
-    account_id = metadata.get('account_id', 'Unknown')
-    timestamp = metadata.get('timestamp', '')
-    duration = metadata.get('scan_duration_seconds', 0)
-    total_resources = len(resources)
 
-    # Group by service
-    services = {}
-    for r in resources:
-        svc = r.get('service', 'unknown')
-        if svc not in services:
-            services[svc] = []
-        services[svc].append(r)
+def format_csv_stream(data: Dict[str, Any], fileobj: TextIO) -> None:
+    """
+    Write inventory data as CSV directly to a file object.
 
-    # Group by region
-    regions = {}
-    for r in resources:
-        reg = r.get('region', 'global') or 'global'
-        if reg not in regions:
-            regions[reg] = 0
-        regions[reg] += 1
+    Args:
+        data: Inventory data with metadata and resources
+        fileobj: Text file object to write to (opened with newline='')
+    """
+    import csv
 
-    # Collect all unique tags
-    all_tags = {}
-    for r in resources:
-        tags = r.get('tags', {})
-        for k, v in tags.items():
-            if k not in all_tags:
-                all_tags[k] = set()
-            all_tags[k].add(v)
-
-    # Count resource types
-    resource_types = {}
-    for r in resources:
-        rt = f"{r.get('service', '')}/{r.get('type', '')}"
-        resource_types[rt] = resource_types.get(rt, 0) + 1
+    resources = data.get('resources', [])
 
-    # Escape function
-    def esc(s):
-        if s is None:
-            return ''
-        return str(s).replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
+    if not resources:
+        fileobj.write(','.join(_CSV_FIELDS) + '\n')
+        return
 
-    # Build service options
-    service_options = '\n'.join(
-        f'<option value="{esc(s)}">{esc(s.upper())}</option>'
-        for s in sorted(services.keys())
-    )
+    csv.writer(fileobj).writerows(_csv_rows(resources))
 
-    # Build region options
-    region_options = '\n'.join(
-        f'<option value="{esc(r)}">{esc(r)}</option>'
-        for r in sorted(regions.keys())
-    )
 
-    # Build tag options (Key=Value format)
-    tag_options = []
-    for k in sorted(all_tags.keys()):
-        for v in sorted(all_tags[k]):
-            tag_options.append(f'<option value="{esc(k)}={esc(v)}">{esc(k)}={esc(v)}</option>')
-    tag_options_html = '\n'.join(tag_options)
-
-    # Detail value formatter
-    def format_detail_value(value):
-        if value is None:
-            return '<span class="detail-value null-value">&mdash;</span>'
-        if isinstance(value, bool):
-            cls = 'bool-true' if value else 'bool-false'
-            text = 'Yes' if value else 'No'
-            return f'<span class="detail-value {cls}">{text}</span>'
-        if isinstance(value, list):
-            if not value:
-                return '<span class="detail-value null-value">&mdash;</span>'
-            items = ''.join(f'<span class="detail-list-item">{esc(str(item))}</span>' for item in value)
-            return f'<span class="detail-value"><span class="detail-list">{items}</span></span>'
-        if isinstance(value, dict):
-            return f'<span class="detail-value">{esc(json.dumps(value, default=str))}</span>'
-        return f'<span class="detail-value">{esc(str(value))}</span>'
-
-    # Detail key formatter: snake_case -> Title Case
-    def format_detail_key(key):
-        return key.replace('_', ' ').title()
-
-    # Build service sections
-    num_columns = 5  # Type, Name, ID/ARN, Region, Tags
-    service_sections = []
-    for service_name in sorted(services.keys()):
-        service_resources = services[service_name]
-        count = len(service_resources)
+def _iter_base64(chunks: Iterator[str]) -> Iterator[str]:
+    """Base64-encode a stream of text chunks as UTF-8 without joining them."""
+    pending = b''
+    for chunk in chunks:
+        pending += chunk.encode('utf-8')
+        # Only whole 3-byte groups can be encoded independently
+        cut = len(pending) - len(pending) % 3
+        if cut:
+            yield base64.b64encode(pending[:cut]).decode('ascii')
+            pending = pending[cut:]
+    if pending:
+        yield base64.b64encode(pending).decode('ascii')
 
-        rows = []
-        for r in service_resources:
-            tags = r.get('tags', {})
-            tag_badges = ''
-            all_tags_html = ''
-            if tags:
-                for k, v in list(tags.items())[:3]:
-                    tag_badges += f'<span class="tag">{esc(k)}={esc(v)}</span>'
-                if len(tags) > 3:
-                    tag_badges += f'<span class="tag more" onclick="toggleTags(this)">+{len(tags)-3}</span>'
-                    all_tags_html = '<div class="tags-tooltip">'
-                    for k, v in tags.items():
-                        all_tags_html += f'<span class="tag">{esc(k)}={esc(v)}</span>'
-                    all_tags_html += '</div>'
-
-            # Build tags data attribute for filtering
-            tags_data = '|'.join(f"{esc(k)}={esc(v)}" for k, v in tags.items()) if tags else ''
-            region_val = r.get('region', 'global') or 'global'
-
-            details = r.get('details', {})
-            has_details = bool(details)
-
-            # Main resource row
-            detail_attrs = ''
-            if has_details:
-                detail_text = ' '.join(str(v) for v in details.values()).lower()
-                detail_text = ''.join(c if c >= ' ' else ' ' for c in detail_text)
-                detail_attrs = f' data-has-details="true" data-details="{esc(detail_text)}" onclick="toggleDetails(this)"'
-
-            default_badge = '<span class="default-badge">DEFAULT</span>' if r.get('is_default') else ''
-
-            rows.append(f'''
-                <tr data-service="{esc(service_name)}" data-region="{esc(region_val)}" data-name="{esc(str(r.get('name', '')).lower())}" data-id="{esc(str(r.get('id', '')).lower())}" data-tags="{tags_data}"{detail_attrs}>
-                    <td>{esc(r.get('type', ''))}{default_badge}</td>
-                    <td>{esc(r.get('name', '') or r.get('id', ''))}</td>
-                    <td class="resource-id" title="Click to copy ARN" onclick="event.stopPropagation(); copyToClipboard(this)">{esc(r.get('arn', '') or r.get('id', ''))}</td>
-                    <td><span class="region-badge" data-region="{esc(region_val)}">{esc(region_val)}</span></td>
-                    <td class="tags-cell">{tag_badges}{all_tags_html}</td>
-                </tr>
-            ''')
-
-            # Detail row (hidden by default)
-            if has_details:
-                detail_items = ''.join(
-                    f'<div class="detail-item"><span class="detail-key">{esc(format_detail_key(k))}</span>{format_detail_value(v)}</div>'
-                    for k, v in details.items()
-                )
-                rows.append(f'''
-                <tr class="details-row collapsed">
-                    <td colspan="{num_columns}">
-                        <div class="details-panel">
-                            <div class="details-grid">{detail_items}</div>
-                        </div>
-                    </td>
-                </tr>
-            ''')
 
-        service_sections.append(f'''
-            <div class="service-section" data-service="{esc(service_name)}">
-                <div class="service-header" onclick="toggleSection(this)">
-                    <span class="service-name">{esc(service_name.upper())}</span>
-                    <span class="service-count">{count} resource{'s' if count != 1 else ''}</span>
-                    <span class="toggle-icon">+</span>
-                </div>
-                <div class="service-content collapsed">
-                    <table>
-                        <thead>
-                            <tr>
-                                <th>Type</th>
-                                <th>Name</th>
-                                <th>ID / ARN</th>
-                                <th>Region</th>
-                                <th>Tags</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                            {''.join(rows)}
-                        </tbody>
-                    </table>
-                </div>
-            </div>
-        ''')
+# Control characters -> space, for the flattened detail search text
+_CTRL_TRANS = dict.fromkeys(range(0x20), 0x20)
 
-    # Build stats cards
-    top_services = sorted(services.items(), key=lambda x: len(x[1]), reverse=True)[:5]
-    service_stats = ''.join(
-        f'<div class="stat-bar"><span class="stat-label">{esc(s.upper())}</span><div class="bar" style="width: {min(100, len(r)*100//max(1,total_resources))}%"></div><span class="stat-value">{len(r)}</span></div>'
-        for s, r in top_services
-    )
 
-    # Build region stats
-    top_regions = sorted(regions.items(), key=lambda x: x[1], reverse=True)[:5]
-    region_stats = ''.join(
-        f'<div class="stat-bar"><span class="stat-label">{esc(reg)}</span><div class="bar region-bar" style="width: {min(100, count*100//max(1,total_resources))}%"></div><span class="stat-value">{count}</span></div>'
-        for reg, count in top_regions
-    )
+def _intern(s: Any) -> Any:
+    """Intern a string aggregation key; other values are returned as-is."""
+    return sys.intern(s) if type(s) is str else s
+
+
+def _esc(s: Any) -> str:
+    """Escape a value for use in HTML text and double-quoted attributes."""
+    if s is None:
+        return ''
+    if type(s) is not str:
+        s = str(s)
+    # Chained replace() beats str.translate here: multi-character
+    # replacements push translate onto CPython's slow path
+    return s.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
+
 
-    html = f'''<!DOCTYPE html>
+# Static report scaffold: document start (title filled in per report), styles
+# and body opening, and the closing footer/scripts. Kept as plain strings so
+# only the dynamic middle of the report is formatted per call.
+_HTML_DOC_START_TMPL = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>awsmap - {esc(account_id)}</title>
-    <style>
-        :root {{
+    <title>awsmap - %s</title>
+    <script>
+        // Apply the saved theme before the body is painted
+        try { if (localStorage.getItem('theme') === 'dark') document.documentElement.classList.add('dark'); } catch (e) {}
+    </script>
+'''
+
+_HTML_HEAD = '''    <style>
+        :root {
             --primary: #0972d3;
             --primary-dark: #033160;
             --accent: #ec7211;
@@ -275,101 +209,101 @@ def format_html(data: Dict[str, Any]) -> str:
             --text-muted: #5f6b7a;
             --border: #d1d5db;
             --header-bg: #232f3e;
-        }}
+        }
 
-        .dark {{
+        .dark {
             --bg: #0f1b2a;
             --card: #192534;
             --text: #d1d5db;
             --text-muted: #8d99ae;
             --border: #414d5c;
             --header-bg: #0f1b2a;
-        }}
+        }
 
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
+        * { margin: 0; padding: 0; box-sizing: border-box; }
 
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
             background: var(--bg);
             color: var(--text);
             font-size: 14px;
             line-height: 1.43;
-        }}
+        }
 
-        .container {{ max-width: 1400px; margin: 0 auto; padding: 20px; }}
+        .container { max-width: 1400px; margin: 0 auto; padding: 20px; }
 
-        header {{
+        header {
             background: var(--header-bg);
             color: white;
             padding: 24px 20px;
             text-align: center;
             margin-bottom: 20px;
             border-radius: 8px;
-        }}
+        }
 
-        header h1 {{ font-size: 24px; font-weight: 700; margin-bottom: 4px; }}
-        header .subtitle {{ opacity: 0.7; font-size: 14px; }}
+        header h1 { font-size: 24px; font-weight: 700; margin-bottom: 4px; }
+        header .subtitle { opacity: 0.7; font-size: 14px; }
 
-        .meta-info {{
+        .meta-info {
             display: flex;
             justify-content: center;
             gap: 16px;
             margin-top: 12px;
             flex-wrap: wrap;
-        }}
+        }
 
-        .meta-item {{
+        .meta-item {
             background: rgba(255,255,255,0.12);
             padding: 4px 12px;
             border-radius: 4px;
             font-size: 12px;
-        }}
+        }
 
-        .stats-grid {{
+        .stats-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
             gap: 12px;
             margin-bottom: 20px;
-        }}
+        }
 
-        .stat-card {{
+        .stat-card {
             background: var(--card);
             border: 1px solid var(--border);
             border-radius: 8px;
             padding: 16px;
             text-align: center;
-        }}
+        }
 
-        .stat-card .number {{
+        .stat-card .number {
             font-size: 2em;
             font-weight: 700;
             color: var(--text);
-        }}
+        }
 
-        .stat-card .label {{
+        .stat-card .label {
             color: var(--text-muted);
             text-transform: uppercase;
             font-size: 11px;
             letter-spacing: 1px;
             margin-top: 4px;
-        }}
+        }
 
-        .controls {{
+        .controls {
             background: var(--card);
             border: 1px solid var(--border);
             border-radius: 8px;
             padding: 16px;
             margin-bottom: 20px;
-        }}
+        }
 
-        .controls-row {{
+        .controls-row {
             display: flex;
             gap: 8px;
             flex-wrap: wrap;
             align-items: center;
-        }}
+        }
 
-        .search-box {{
+        .search-box {
             flex: 1;
             min-width: 220px;
             padding: 8px 12px;
@@ -378,15 +312,15 @@ def format_html(data: Dict[str, Any]) -> str:
             font-size: 14px;
             background: var(--card);
             color: var(--text);
-        }}
+        }
 
-        .search-box:focus {{
+        .search-box:focus {
             outline: none;
             border-color: var(--primary);
             box-shadow: 0 0 0 2px rgba(9,114,211,0.2);
-        }}
+        }
 
-        .filter-select {{
+        .filter-select {
             padding: 8px 12px;
             border: 1px solid var(--border);
             border-radius: 4px;
@@ -394,38 +328,38 @@ def format_html(data: Dict[str, Any]) -> str:
             background: var(--card);
             color: var(--text);
             min-width: 140px;
-        }}
+        }
 
-        .btn {{
+        .btn {
             padding: 8px 16px;
             border: none;
             border-radius: 4px;
             font-size: 14px;
             cursor: pointer;
             transition: all 0.15s;
-        }}
+        }
 
-        .btn-primary {{
+        .btn-primary {
             background: var(--accent);
             color: #000716;
             font-weight: 600;
-        }}
+        }
 
-        .btn-primary:hover {{
+        .btn-primary:hover {
             background: #eb5f07;
-        }}
+        }
 
-        .btn-secondary {{
+        .btn-secondary {
             background: var(--card);
             color: var(--text);
             border: 1px solid var(--border);
-        }}
+        }
 
-        .btn-secondary:hover {{
+        .btn-secondary:hover {
             background: var(--bg);
-        }}
+        }
 
-        .theme-toggle {{
+        .theme-toggle {
             position: fixed;
             top: 16px;
             right: 16px;
@@ -437,64 +371,64 @@ def format_html(data: Dict[str, Any]) -> str:
             border-radius: 50%;
             cursor: pointer;
             font-size: 1em;
-        }}
+        }
 
-        .charts-row {{
+        .charts-row {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
             gap: 12px;
             margin-bottom: 20px;
-        }}
+        }
 
-        .chart-card {{
+        .chart-card {
             background: var(--card);
             border: 1px solid var(--border);
             border-radius: 8px;
             padding: 16px;
-        }}
+        }
 
-        .chart-card h3 {{
+        .chart-card h3 {
             margin-bottom: 12px;
             font-size: 14px;
             font-weight: 600;
             color: var(--text);
-        }}
+        }
 
-        .stat-bar {{
+        .stat-bar {
             display: flex;
             align-items: center;
             gap: 8px;
             margin-bottom: 8px;
-        }}
+        }
 
-        .stat-bar .stat-label {{
+        .stat-bar .stat-label {
             width: 80px;
             font-size: 12px;
             color: var(--text-muted);
-        }}
+        }
 
-        .stat-bar .bar {{
+        .stat-bar .bar {
             height: 20px;
             background: var(--primary);
             border-radius: 2px;
             min-width: 4px;
-        }}
+        }
 
-        .stat-bar .stat-value {{
+        .stat-bar .stat-value {
             font-weight: 600;
             font-size: 14px;
             min-width: 36px;
-        }}
+        }
 
-        .service-section {{
+        .service-section {
             background: var(--card);
             border: 1px solid var(--border);
             border-radius: 8px;
             margin-bottom: 8px;
             overflow: hidden;
-        }}
+        }
 
-        .service-header {{
+        .service-header {
             display: flex;
             align-items: center;
             padding: 12px 16px;
@@ -502,65 +436,65 @@ def format_html(data: Dict[str, Any]) -> str:
             background: var(--card);
             border-bottom: 1px solid var(--border);
             transition: background 0.15s;
-        }}
+        }
 
-        .service-header:hover {{
+        .service-header:hover {
             background: var(--bg);
-        }}
+        }
 
-        .service-name {{
+        .service-name {
             font-weight: 600;
             font-size: 14px;
             color: var(--primary);
-        }}
+        }
 
-        .service-count {{
+        .service-count {
             margin-left: auto;
             margin-right: 12px;
             color: var(--text-muted);
             font-size: 12px;
-        }}
+        }
 
-        .toggle-icon {{
+        .toggle-icon {
             width: 24px;
             text-align: center;
             font-weight: bold;
             color: var(--text-muted);
-        }}
+        }
 
-        .service-content {{
+        .service-content {
             overflow-x: auto;
-        }}
+        }
 
-        .service-content.collapsed {{
+        .service-content.collapsed {
             display: none;
-        }}
+        }
 
-        table {{
+        table {
             width: 100%;
             border-collapse: collapse;
-        }}
+        }
 
-        th, td {{
+        th, td {
             padding: 10px 12px;
             text-align: left;
             border-bottom: 1px solid var(--border);
-        }}
+        }
 
-        th {{
+        th {
             background: var(--bg);
             font-weight: 600;
             color: var(--text-muted);
             text-transform: uppercase;
             font-size: 12px;
             letter-spacing: 0.5px;
-        }}
+        }
 
-        tr:hover {{
+        tr:hover {
             background: var(--bg);
-        }}
+        }
 
-        .resource-id {{
+        .resource-id {
             font-family: 'SF Mono', Monaco, monospace;
             font-size: 12px;
             color: var(--text-muted);
@@ -570,9 +504,9 @@ def format_html(data: Dict[str, Any]) -> str:
             line-height: 1.4;
             position: relative;
             padding-right: 24px;
-        }}
+        }
 
-        .resource-id::after {{
+        .resource-id::after {
             content: '\\1F4CB';
             position: absolute;
             right: 4px;
@@ -581,54 +515,54 @@ def format_html(data: Dict[str, Any]) -> str:
             opacity: 0;
             font-size: 0.9em;
             transition: opacity 0.2s;
-        }}
+        }
 
-        .resource-id:hover {{
+        .resource-id:hover {
             color: var(--primary);
             background: var(--bg);
-        }}
+        }
 
-        .resource-id:hover::after {{
+        .resource-id:hover::after {
             opacity: 0.7;
-        }}
+        }
 
-        .resource-id.copied::after {{
+        .resource-id.copied::after {
             content: '\\2705';
             opacity: 1;
-        }}
+        }
 
-        .region-badge {{
+        .region-badge {
             display: inline-block;
             padding: 2px 8px;
             border-radius: 4px;
             font-size: 12px;
             font-weight: 500;
-        }}
+        }
 
         /* Region color coding */
-        .region-badge[data-region^="us-"] {{ background: #f0f4ff; color: #0050b3; }}
-        .region-badge[data-region^="eu-"] {{ background: #f0faf0; color: #1a7f37; }}
-        .region-badge[data-region^="ap-"] {{ background: #fff8f0; color: #9a6700; }}
-        .region-badge[data-region^="sa-"] {{ background: #fdf0f7; color: #953b70; }}
-        .region-badge[data-region^="ca-"] {{ background: #f5f0ff; color: #6941c6; }}
-        .region-badge[data-region^="af-"] {{ background: #fff4f0; color: #b93815; }}
-        .region-badge[data-region^="me-"] {{ background: #fff0f0; color: #b91c1c; }}
-        .region-badge[data-region="global"] {{ background: #f0f0f5; color: #414d5c; }}
-
-        .dark .region-badge[data-region^="us-"] {{ background: #0a2744; color: #89bdff; }}
-        .dark .region-badge[data-region^="eu-"] {{ background: #0a2e1a; color: #7ee2a8; }}
-        .dark .region-badge[data-region^="ap-"] {{ background: #2e1e00; color: #f5c451; }}
-        .dark .region-badge[data-region^="sa-"] {{ background: #2e0a1e; color: #e8a0c8; }}
-        .dark .region-badge[data-region^="ca-"] {{ background: #1e0a3e; color: #c4b5fd; }}
-        .dark .region-badge[data-region^="af-"] {{ background: #2e1208; color: #fdba74; }}
-        .dark .region-badge[data-region^="me-"] {{ background: #2e0a0a; color: #fca5a5; }}
-        .dark .region-badge[data-region="global"] {{ background: #1e2a3a; color: #8d99ae; }}
-
-        .stat-bar .region-bar {{
+        .region-badge.r-us { background: #f0f4ff; color: #0050b3; }
+        .region-badge.r-eu { background: #f0faf0; color: #1a7f37; }
+        .region-badge.r-ap { background: #fff8f0; color: #9a6700; }
+        .region-badge.r-sa { background: #fdf0f7; color: #953b70; }
+        .region-badge.r-ca { background: #f5f0ff; color: #6941c6; }
+        .region-badge.r-af { background: #fff4f0; color: #b93815; }
+        .region-badge.r-me { background: #fff0f0; color: #b91c1c; }
+        .region-badge.r-global { background: #f0f0f5; color: #414d5c; }
+
+        .dark .region-badge.r-us { background: #0a2744; color: #89bdff; }
+        .dark .region-badge.r-eu { background: #0a2e1a; color: #7ee2a8; }
+        .dark .region-badge.r-ap { background: #2e1e00; color: #f5c451; }
+        .dark .region-badge.r-sa { background: #2e0a1e; color: #e8a0c8; }
+        .dark .region-badge.r-ca { background: #1e0a3e; color: #c4b5fd; }
+        .dark .region-badge.r-af { background: #2e1208; color: #fdba74; }
+        .dark .region-badge.r-me { background: #2e0a0a; color: #fca5a5; }
+        .dark .region-badge.r-global { background: #1e2a3a; color: #8d99ae; }
+
+        .stat-bar .region-bar {
             background: #037f0c;
-        }}
+        }
 
-        .tag {{
+        .tag {
             display: inline-block;
             padding: 2px 8px;
             background: #f0f4ff;
@@ -638,27 +572,27 @@ def format_html(data: Dict[str, Any]) -> str:
             font-size: 11px;
             margin-right: 4px;
             margin-bottom: 2px;
-        }}
+        }
 
-        .dark .tag {{
+        .dark .tag {
             background: #0a2744;
             color: #89bdff;
             border-color: #1a3a5c;
-        }}
+        }
 
-        .tag.more {{
+        .tag.more {
             background: var(--bg);
             color: var(--text-muted);
             border-color: var(--border);
             cursor: pointer;
-        }}
+        }
 
-        .tag.more:hover {{
+        .tag.more:hover {
             border-color: var(--primary);
             color: var(--primary);
-        }}
+        }
 
-        .default-badge {{
+        .default-badge {
             display: inline-block;
             padding: 1px 6px;
             background: #fff3e0;
@@ -670,20 +604,20 @@ def format_html(data: Dict[str, Any]) -> str:
             letter-spacing: 0.5px;
             margin-left: 6px;
             vertical-align: middle;
-        }}
+        }
 
-        .dark .default-badge {{
+        .dark .default-badge {
             background: #3e2723;
             color: #ffab91;
             border-color: #5d4037;
-        }}
+        }
 
-        .tags-cell {{
+        .tags-cell {
             max-width: 300px;
             position: relative;
-        }}
+        }
 
-        .tags-tooltip {{
+        .tags-tooltip {
             display: none;
             position: absolute;
             background: var(--card);
@@ -695,115 +629,115 @@ def format_html(data: Dict[str, Any]) -> str:
             max-width: 400px;
             top: 100%;
             left: 0;
-        }}
+        }
 
-        .tags-tooltip.show {{
+        .tags-tooltip.show {
             display: block;
-        }}
+        }
 
-        .tags-tooltip .tag {{
+        .tags-tooltip .tag {
             margin-bottom: 4px;
-        }}
+        }
 
         /* Detail rows */
-        .details-row {{
+        .details-row {
             background: var(--bg);
-        }}
+        }
 
-        .details-row.collapsed {{
+        .details-row.collapsed {
             display: none;
-        }}
+        }
 
-        .details-row:hover {{
+        .details-row:hover {
             background: var(--bg);
-        }}
+        }
 
-        .details-row td {{
+        .details-row td {
             padding: 0;
             border-bottom: 1px solid var(--border);
-        }}
+        }
 
-        .details-panel {{
+        .details-panel {
             padding: 12px 16px;
-        }}
+        }
 
-        .details-grid {{
+        .details-grid {
             display: grid;
             grid-template-columns: repeat(auto-fill, minmax(280px, 1fr));
             gap: 4px 20px;
-        }}
+        }
 
-        .detail-item {{
+        .detail-item {
             display: flex;
             gap: 8px;
             padding: 4px 0;
             min-width: 0;
             overflow: hidden;
-        }}
+        }
 
-        .detail-key {{
+        .detail-key {
             color: var(--text-muted);
             font-size: 12px;
             min-width: 120px;
             flex-shrink: 0;
-        }}
+        }
 
-        .detail-value {{
+        .detail-value {
             font-family: 'SF Mono', Monaco, monospace;
             font-size: 12px;
             overflow-wrap: break-word;
             min-width: 0;
-        }}
+        }
 
-        .detail-value.bool-true {{
+        .detail-value.bool-true {
             color: #037f0c;
-        }}
+        }
 
-        .detail-value.bool-false {{
+        .detail-value.bool-false {
             color: #d91515;
-        }}
+        }
 
-        .dark .detail-value.bool-true {{
+        .dark .detail-value.bool-true {
             color: #29ad32;
-        }}
+        }
 
-        .dark .detail-value.bool-false {{
+        .dark .detail-value.bool-false {
             color: #ff7979;
-        }}
+        }
 
-        .detail-value.null-value {{
+        .detail-value.null-value {
             color: var(--text-muted);
             font-style: italic;
-        }}
+        }
 
-        .detail-list {{
+        .detail-list {
             display: flex;
             flex-wrap: wrap;
             gap: 4px;
-        }}
+        }
 
-        .detail-list-item {{
+        .detail-list-item {
             display: inline-block;
             padding: 2px 8px;
             background: var(--bg);
             border: 1px solid var(--border);
             border-radius: 4px;
             font-size: 12px;
-        }}
+        }
 
-        mark {{ background: #fef08a; color: #000716; padding: 1px 2px; border-radius: 2px; }}
-        .dark mark {{ background: #854d0e; color: #fef3c7; }}
+        mark { background: #fef08a; color: #000716; padding: 1px 2px; border-radius: 2px; }
+        .dark mark { background: #854d0e; color: #fef3c7; }
 
-        tr[data-has-details] {{
+        tr[data-has-details] {
             cursor: pointer;
-        }}
+        }
 
-        tr[data-has-details] td:first-child {{
+        tr[data-has-details] td:first-child {
             position: relative;
             padding-left: 28px;
-        }}
+        }
 
-        tr[data-has-details] td:first-child::before {{
+        tr[data-has-details] td:first-child::before {
             content: '\\25B6';
             position: absolute;
             left: 10px;
@@ -812,15 +746,15 @@ def format_html(data: Dict[str, Any]) -> str:
             font-size: 0.65em;
             color: var(--text-muted);
             transition: transform 0.2s;
-        }}
+        }
 
-        tr[data-has-details].expanded td:first-child::before {{
+        tr[data-has-details].expanded td:first-child::before {
             transform: translateY(-50%) rotate(90deg);
-        }}
+        }
 
-        .hidden {{ display: none !important; }}
+        .hidden { display: none !important; }
 
-        .toast {{
+        .toast {
             position: fixed;
             bottom: 20px;
             right: 20px;
@@ -831,78 +765,721 @@ def format_html(data: Dict[str, Any]) -> str:
             opacity: 0;
             transition: opacity 0.3s;
             z-index: 1000;
-        }}
+        }
 
-        .toast.show {{ opacity: 1; }}
+        .toast.show { opacity: 1; }
 
-        .export-btns {{
+        .export-btns {
             display: flex;
             gap: 8px;
             margin-top: 12px;
-        }}
+        }
 
-        footer {{
+        footer {
             text-align: center;
             padding: 24px 20px;
             color: var(--text-muted);
             border-top: 1px solid var(--border);
             margin-top: 32px;
-        }}
+        }
 
-        .footer-logo {{
+        .footer-logo {
             font-size: 1.3em;
             font-weight: 700;
             color: #ec7211;
-        }}
-
-        @media (max-width: 768px) {{
-            header h1 {{ font-size: 20px; }}
-            .meta-info {{ flex-direction: column; gap: 8px; }}
-            .controls-row {{ flex-direction: column; }}
-            .search-box, .filter-select {{ width: 100%; }}
-            .stats-grid {{ grid-template-columns: repeat(2, 1fr); }}
-        }}
-
-        @media print {{
-            .controls, .theme-toggle, .export-btns, .toggle-icon {{ display: none; }}
-            .service-content.collapsed {{ display: block; }}
-            .details-row.collapsed {{ display: table-row; }}
-            tr[data-has-details] td:first-child::before {{ content: none; }}
-            body {{ background: white; }}
-        }}
+        }
+
+        @media (max-width: 768px) {
+            header h1 { font-size: 20px; }
+            .meta-info { flex-direction: column; gap: 8px; }
+            .controls-row { flex-direction: column; }
+            .search-box, .filter-select { width: 100%; }
+            .stats-grid { grid-template-columns: repeat(2, 1fr); }
+        }
+
+        @media print {
+            .controls, .theme-toggle, .export-btns, .toggle-icon { display: none; }
+            .service-content.collapsed { display: block; }
+            .details-row.collapsed { display: table-row; }
+            tr[data-has-details] td:first-child::before { content: none; }
+            body { background: white; }
+        }
     </style>
 </head>
 <body>
-    <button class="theme-toggle" onclick="toggleTheme()" title="Toggle dark mode">
+    <button class="theme-toggle" data-act="toggleTheme" title="Toggle dark mode">
         <span id="theme-icon">&#x1F319;</span>
     </button>
 
     <div class="container">
-        <header>
+'''
+
+_HTML_TAIL = '''
+
+        <footer>
+            <div class="footer-logo">awsmap</div>
+        </footer>
+    </div>
+
+    <div class="toast" id="toast">Copied!</div>
+
+    <script>
+        function toggleTheme() {
+            const dark = document.documentElement.classList.toggle('dark');
+            document.getElementById('theme-icon').innerHTML = dark ? '&#x2600;' : '&#x1F319;';
+            localStorage.setItem('theme', dark ? 'dark' : 'light');
+        }
+
+        // The theme class itself is set by the script in <head>
+        if (document.documentElement.classList.contains('dark')) {
+            document.getElementById('theme-icon').innerHTML = '&#x2600;';
+        }
+
+        const HTML_ESCAPES = {'&': '&amp;', '<': '&lt;', '>': '&gt;'};
+        function escapeHtml(s) {
+            return s.replace(/[&<>]/g, c => HTML_ESCAPES[c]);
+        }
+
+        // Fast path for cells holding a single run of text: the marked-up
+        // markup is built as one string and assigned with a single innerHTML.
+        // The original text is kept on the cell so clearing is one write.
+        function highlightPlain(cell, termLower) {
+            const text = cell.textContent;
+            const lower = text.toLowerCase();
+            let idx = lower.indexOf(termLower);
+            if (idx === -1) return false;
+            const len = termLower.length;
+            let html = '', lastIdx = 0;
+            do {
+                html += escapeHtml(text.substring(lastIdx, idx)) +
+                    '<mark>' + escapeHtml(text.substring(idx, idx + len)) + '</mark>';
+                lastIdx = idx + len;
+            } while ((idx = lower.indexOf(termLower, lastIdx)) !== -1);
+            cell.innerHTML = html + escapeHtml(text.substring(lastIdx));
+            cell.__origText = text;
+            return true;
+        }
+
+        // Shared by every tree walk; empty text nodes can never match
+        const TEXT_FILTER = {
+            acceptNode: n => n.nodeValue ? NodeFilter.FILTER_ACCEPT : NodeFilter.FILTER_SKIP
+        };
+
+        function highlightTree(node, termLower) {
+            const walker = document.createTreeWalker(node, NodeFilter.SHOW_TEXT, TEXT_FILTER);
+            const len = termLower.length;
+            let found = false;
+            const textNodes = [];
+            while (walker.nextNode()) textNodes.push(walker.currentNode);
+            for (let i = 0; i < textNodes.length; i++) {
+                const textNode = textNodes[i];
+                const text = textNode.nodeValue;
+                const lower = text.toLowerCase();
+                let idx = lower.indexOf(termLower);
+                if (idx === -1) continue;
+                const frag = document.createDocumentFragment();
+                let lastIdx = 0;
+                do {
+                    if (idx > lastIdx) frag.appendChild(document.createTextNode(text.substring(lastIdx, idx)));
+                    const mark = document.createElement('mark');
+                    mark.textContent = text.substring(idx, idx + len);
+                    frag.appendChild(mark);
+                    lastIdx = idx + len;
+                } while ((idx = lower.indexOf(termLower, lastIdx)) !== -1);
+                if (lastIdx < text.length) frag.appendChild(document.createTextNode(text.substring(lastIdx)));
+                textNode.parentNode.replaceChild(frag, textNode);
+                found = true;
+            }
+            return found;
+        }
+
+        // termLower is the already-lowercased search term. cells defaults to
+        // the detail values of a details row; main rows pass their type,
+        // name and ID cells.
+        function highlightMatches(element, termLower, cells) {
+            clearHighlights(element);
+            if (!termLower) return;
+            if (!cells) cells = element.querySelectorAll('.detail-value');
+            const marked = [];
+            for (let i = 0, n = cells.length; i < n; i++) {
+                const cell = cells[i];
+                // Name/ID cells and scalar detail values have no child elements
+                const hit = cell.firstElementChild
+                    ? highlightTree(cell, termLower)
+                    : highlightPlain(cell, termLower);
+                if (hit) marked.push(cell);
+            }
+            // Remembered so clearHighlights can go straight to these cells
+            if (marked.length) element.__hlCells = marked;
+        }
+
+        // Main-row highlights are applied lazily: filterResources records the
+        // term on the row entry and this observer marks it up once the row comes
+        // within 200px of the viewport.
+        const hlObserver = new IntersectionObserver(entries => {
+            for (let i = 0; i < entries.length; i++) {
+                const e = entries[i];
+                if (!e.isIntersecting) continue;
+                highlightPending(ROW_BY_TR.get(e.target));
+            }
+        }, {rootMargin: '200px'});
+
+        function highlightPending(r) {
+            const row = r.tr;
+            if (r.pendingHighlight) {
+                highlightMatches(row, r.pendingHighlight, Array.prototype.slice.call(row.cells, 0, 3));
+                r.pendingHighlight = '';
+            }
+            hlObserver.unobserve(row);
+        }
+
+        function deferHighlight(r, termLower) {
+            r.pendingHighlight = termLower;
+            hlObserver.observe(r.tr);
+        }
+
+        function clearRowHighlight(r) {
+            if (r.pendingHighlight) {
+                r.pendingHighlight = '';
+                hlObserver.unobserve(r.tr);
+            }
+            clearHighlights(r.tr);
+        }
+
+        // Printing shows every row, so build any rows still held in templates
+        // and apply whatever highlights are still pending
+        window.addEventListener('beforeprint', () => {
+            for (let i = 0, n = SECTIONS.length; i < n; i++) materialize(SECTIONS[i]);
+            for (let i = 0, n = ROWS.length; i < n; i++) {
+                if (ROWS[i].pendingHighlight) highlightPending(ROWS[i]);
+            }
+        });
+
+        function clearHighlights(element) {
+            const cells = element.__hlCells;
+            if (!cells) return;
+            element.__hlCells = null;
+            for (let i = 0; i < cells.length; i++) {
+                const cell = cells[i];
+                if (cell.__origText !== undefined) {
+                    cell.textContent = cell.__origText;
+                    cell.__origText = undefined;
+                    continue;
+                }
+                // Cells with nested markup: unwrap each mark in place
+                cell.querySelectorAll('mark').forEach(mark => {
+                    const parent = mark.parentNode;
+                    parent.replaceChild(document.createTextNode(mark.textContent), mark);
+                    parent.normalize();
+                });
+            }
+        }
+
+        // Leading and trailing debounce with a maximum wait: the first call of
+        // a burst runs immediately, later calls are coalesced into one trailing
+        // run, and a steady burst still runs at least every maxWait ms.
+        function debounce(fn, wait, maxWait) {
+            let timer = null;
+            let pending = false;
+            let lastRun = 0;
+            function run() {
+                pending = false;
+                lastRun = Date.now();
+                fn();
+            }
+            function expire() {
+                timer = null;
+                if (pending) run();
+            }
+            return function () {
+                if (timer === null) {
+                    run();
+                } else {
+                    clearTimeout(timer);
+                    pending = true;
+                    if (Date.now() - lastRun >= maxWait) run();
+                }
+                const remaining = maxWait - (Date.now() - lastRun);
+                timer = setTimeout(expire, pending ? Math.min(wait, remaining) : wait);
+            };
+        }
+
+        const debouncedFilter = debounce(filterResources, 120, 300);
+
+        // Large reports ship each section's rows inside an inert <template>;
+        // they are moved into the table the first time the section is shown.
+        // Row entries keep pointing at the same nodes before and after.
+        function materialize(sec) {
+            if (!sec.tpl) return;
+            sec.tbody.appendChild(sec.tpl.content);
+            sec.tpl.remove();
+            sec.tpl = null;
+        }
+
+        // Open/closed state lives on the section and row entries, so these
+        // only write to the DOM when the state actually changes.
+        function setSectionCollapsed(sec, collapsed) {
+            if (sec.collapsed === collapsed) return;
+            if (!collapsed) materialize(sec);
+            sec.content.classList.toggle('collapsed', collapsed);
+            if (sec.icon) sec.icon.textContent = collapsed ? '+' : '-';
+            sec.collapsed = collapsed;
+        }
+
+        function setRowExpanded(r, expanded) {
+            if (r.expanded === expanded) return;
+            r.detailTr.classList.toggle('collapsed', !expanded);
+            r.tr.classList.toggle('expanded', expanded);
+            r.expanded = expanded;
+        }
+
+        function toggleSection(header) {
+            const sec = SECTION_BY_EL.get(header.parentElement);
+            setSectionCollapsed(sec, !sec.collapsed);
+        }
+
+        function expandAll() {
+            for (let i = 0, n = SECTIONS.length; i < n; i++) setSectionCollapsed(SECTIONS[i], false);
+            for (let i = 0, n = DETAIL_ENTRIES.length; i < n; i++) setRowExpanded(DETAIL_ENTRIES[i], true);
+        }
+
+        function collapseAll() {
+            for (let i = 0, n = SECTIONS.length; i < n; i++) setSectionCollapsed(SECTIONS[i], true);
+            for (let i = 0, n = DETAIL_ENTRIES.length; i < n; i++) setRowExpanded(DETAIL_ENTRIES[i], false);
+        }
+
+        function toggleDetails(row) {
+            const r = ROW_BY_TR.get(row);
+            if (r && r.detailTr) setRowExpanded(r, !r.expanded);
+        }
+
+        // Dashboard counters for the currently visible rows, seeded from the
+        // counts the page was rendered with. They are adjusted whenever a row
+        // changes visibility, so a filter pass only pays for the rows that
+        // changed and renderDashboard never rescans the table.
+        const INITIAL_DASH = window.__INITIAL_DASH__;
+        const serviceCounts = new Map(INITIAL_DASH.services);
+        const regionCounts = new Map(INITIAL_DASH.regions);
+        const typeCounts = new Map(INITIAL_DASH.types);
+        let visibleTotal = INITIAL_DASH.total;
+        let dashDirty = false;
+
+        function bump(counts, key, delta) {
+            const n = (counts.get(key) || 0) + delta;
+            if (n) counts.set(key, n); else counts.delete(key);
+        }
+
+        function setVisible(row, visible) {
+            if (row.visible === visible) return;
+            row.visible = visible;
+            const delta = visible ? 1 : -1;
+            bump(serviceCounts, row.svc, delta);
+            bump(regionCounts, row.reg, delta);
+            bump(typeCounts, row.typeKey, delta);
+            visibleTotal += delta;
+            dashDirty = true;
+        }
+
+        // Largest first; ties ordered by name so the charts stay stable
+        function topEntries(counts) {
+            return [...counts].sort((a, b) => b[1] - a[1] || (a[0] < b[0] ? -1 : a[0] > b[0] ? 1 : 0)).slice(0, 5);
+        }
+
+        function setText(el, text) {
+            if (el.textContent !== text) el.textContent = text;
+        }
+
+        // Update a top-5 chart in place. The bar elements are only rebuilt
+        // when the number of bars changes; otherwise just their label, width
+        // and value are rewritten.
+        function renderBars(chart, entries, barClass, scale, upper) {
+            const bars = chart.children;
+            if (bars.length !== entries.length) {
+                let html = '';
+                for (let i = 0; i < entries.length; i++) {
+                    html += '<div class="stat-bar"><span class="stat-label"></span><div class="' + barClass +
+                        '"></div><span class="stat-value"></span></div>';
+                }
+                chart.innerHTML = html;
+            }
+            for (let i = 0; i < entries.length; i++) {
+                const key = entries[i][0], count = entries[i][1];
+                const parts = bars[i].children;
+                setText(parts[0], upper ? key.toUpperCase() : key);
+                const width = Math.min(100, Math.round(count * scale)) + '%';
+                if (parts[1].style.width !== width) parts[1].style.width = width;
+                setText(parts[2], String(count));
+            }
+        }
+
+        function renderDashboard() {
+            // Nothing changed visibility since the last render
+            if (!dashDirty) return;
+            dashDirty = false;
+            const total = visibleTotal;
+            setText(document.getElementById('stat-total'), total.toLocaleString());
+            setText(document.getElementById('stat-services'), String(serviceCounts.size));
+            setText(document.getElementById('stat-regions'), String(regionCounts.size));
+            setText(document.getElementById('stat-types'), String(typeCounts.size));
+
+            const scale = 100 / Math.max(1, total);
+            renderBars(document.getElementById('chart-services'), topEntries(serviceCounts), 'bar', scale, true);
+            renderBars(document.getElementById('chart-regions'), topEntries(regionCounts), 'bar region-bar', scale, false);
+        }
+
+        // Search index and node references, built once from each section's row
+        // data. SECTIONS holds one entry per service section; ROWS one entry
+        // per resource row. The data-* attributes are read here only; all
+        // later lookups go through these entries. DETAIL_ENTRIES holds the
+        // rows that have a details row, for expandAll/collapseAll.
+        const SECTIONS = [];
+        const SECTION_BY_EL = new Map();
+        const ROWS = [];
+        const ROW_BY_TR = new Map();
+        const DETAIL_ENTRIES = [];
+        (function initRows() {
+            document.querySelectorAll('.service-section').forEach(section => {
+                const data = JSON.parse(section.querySelector('script.rows-data').textContent);
+                let n = 0;
+                const tpl = section.querySelector('template.rows-tpl');
+                const sec = {
+                    el: section,
+                    svc: section.dataset.service,
+                    tbody: section.querySelector('tbody'),
+                    tpl: tpl,
+                    content: section.querySelector('.service-content'),
+                    icon: section.querySelector('.toggle-icon'),
+                    countEl: section.querySelector('.service-count'),
+                    rows: [],
+                    // Sections are rendered collapsed and visible
+                    collapsed: true,
+                    shown: true,
+                    autoExpanded: false
+                };
+                const rowRoot = tpl ? tpl.content : sec.tbody;
+                rowRoot.querySelectorAll('tr:not(.details-row)').forEach(tr => {
+                    const d = data[n++];
+                    const next = tr.nextElementSibling;
+                    const row = {
+                        tr: tr,
+                        detailTr: next && next.classList.contains('details-row') ? next : null,
+                        svc: tr.dataset.service,
+                        reg: tr.dataset.region,
+                        typeKey: '',
+                        name: d[0],
+                        id: d[1],
+                        // details is only present with include_detail_search
+                        details: d[3] || '',
+                        tags: new Set(d[2]),
+                        // visible: counted by the dashboard and export;
+                        // shown: the row's own hidden class is absent
+                        visible: true,
+                        shown: true,
+                        // Details rows are rendered collapsed
+                        expanded: false,
+                        // Search term awaiting hlObserver, and whether the
+                        // details row was opened by the search
+                        pendingHighlight: '',
+                        autoExpanded: false
+                    };
+                    // Type text without the DEFAULT badge, keyed like the
+                    // server-side counts
+                    const typeText = tr.cells[0].firstChild;
+                    row.typeKey = row.svc + '/' + (typeText && typeText.nodeType === 3 ? typeText.nodeValue : '');
+                    if (row.detailTr) DETAIL_ENTRIES.push(row);
+                    sec.rows.push(row);
+                    ROWS.push(row);
+                    ROW_BY_TR.set(tr, row);
+                });
+                SECTIONS.push(sec);
+                SECTION_BY_EL.set(section, sec);
+            });
+        })();
+
+        // Rows written per animation frame; larger inventories are spread
+        // over several frames so typing stays responsive.
+        const FILTER_CHUNK = 500;
+        let filterFrame = 0;
+
+        // Write phase for one row. nextVisible/nextExpand were decided
+        // beforehand; classes are only touched when their state changes.
+        function applyRow(r, search) {
+            const row = r.tr;
+            const detailRow = r.detailTr;
+            const visible = r.nextVisible;
+            if (visible !== r.shown) {
+                row.classList.toggle('hidden', !visible);
+                if (detailRow) detailRow.classList.toggle('hidden', !visible);
+                r.shown = visible;
+            }
+            setVisible(r, visible);
+
+            if (visible) {
+                if (search) {
+                    deferHighlight(r, search);
+                } else {
+                    clearRowHighlight(r);
+                }
+                if (detailRow) {
+                    if (r.nextExpand) {
+                        setRowExpanded(r, true);
+                        r.autoExpanded = true;
+                        highlightMatches(detailRow, search);
+                    } else if (r.autoExpanded) {
+                        setRowExpanded(r, false);
+                        r.autoExpanded = false;
+                        clearHighlights(detailRow);
+                    }
+                }
+            } else {
+                clearRowHighlight(r);
+                if (detailRow) clearHighlights(detailRow);
+                r.autoExpanded = false;
+            }
+        }
+
+        function finishSection(sec, visibleCount, search) {
+            // -1: excluded by the service filter
+            const hasVisible = visibleCount > 0;
+            if (sec.shown !== hasVisible) {
+                sec.el.classList.toggle('hidden', !hasVisible);
+                sec.shown = hasVisible;
+            }
+            if (visibleCount < 0) return;
+
+            const countEl = sec.countEl;
+            if (countEl) {
+                countEl.textContent = visibleCount + ' resource' + (visibleCount !== 1 ? 's' : '');
+            }
+
+            if (hasVisible && search) {
+                setSectionCollapsed(sec, false);
+                sec.autoExpanded = true;
+            } else if (!search && sec.autoExpanded) {
+                setSectionCollapsed(sec, true);
+                sec.autoExpanded = false;
+            }
+        }
+
+        function filterResources() {
+            // A new filter supersedes one still running from a previous call
+            if (filterFrame) {
+                cancelAnimationFrame(filterFrame);
+                filterFrame = 0;
+            }
+
+            const search = document.getElementById('searchBox').value.toLowerCase();
+            const service = document.getElementById('serviceFilter').value;
+            const region = document.getElementById('regionFilter').value;
+            const tag = document.getElementById('tagFilter').value;
+
+            // Phase 1: decide visibility from the index alone, no DOM access.
+            // counts[s] is the number of visible rows, or -1 for a section
+            // excluded by the service filter.
+            const counts = new Array(SECTIONS.length);
+            for (let s = 0; s < SECTIONS.length; s++) {
+                const sec = SECTIONS[s];
+                const rows = sec.rows;
+                if (service && sec.svc !== service) {
+                    for (let i = 0, n = rows.length; i < n; i++) setVisible(rows[i], false);
+                    counts[s] = -1;
+                    continue;
+                }
+                let visibleCount = 0;
+                for (let i = 0, n = rows.length; i < n; i++) {
+                    const r = rows[i];
+                    const matchedInName = search && (r.name.indexOf(search) !== -1 || r.id.indexOf(search) !== -1);
+                    const matchedInDetails = search && r.details.indexOf(search) !== -1;
+                    const matchRegion = !region || r.reg === region;
+                    const matchSearch = !search || matchedInName || matchedInDetails;
+                    const matchTag = !tag || r.tags.has(tag);
+                    r.nextVisible = !!(matchRegion && matchSearch && matchTag);
+                    r.nextExpand = !!matchedInDetails;
+                    if (r.nextVisible) visibleCount++;
+                }
+                counts[s] = visibleCount;
+            }
+
+            // Phase 2: apply row changes a chunk per frame, then write the
+            // section headers and the dashboard together in one final frame.
+            let s = 0, i = 0;
+            function finish() {
+                filterFrame = 0;
+                for (let k = 0; k < SECTIONS.length; k++) finishSection(SECTIONS[k], counts[k], search);
+                renderDashboard();
+            }
+            function step() {
+                let budget = FILTER_CHUNK;
+                while (s < SECTIONS.length && budget > 0) {
+                    const rows = SECTIONS[s].rows;
+                    if (counts[s] >= 0) {
+                        for (const n = rows.length; i < n && budget > 0; i++, budget--) applyRow(rows[i], search);
+                        if (i < rows.length) break;
+                    }
+                    s++;
+                    i = 0;
+                }
+                filterFrame = requestAnimationFrame(s < SECTIONS.length ? step : finish);
+            }
+            step();
+        }
+
+        function clearFilters() {
+            document.getElementById('searchBox').value = '';
+            document.getElementById('serviceFilter').value = '';
+            document.getElementById('regionFilter').value = '';
+            document.getElementById('tagFilter').value = '';
+            filterResources();
+        }
+
+        function copyToClipboard(el) {
+            navigator.clipboard.writeText(el.textContent.trim()).then(() => {
+                el.classList.add('copied');
+                const toast = document.getElementById('toast');
+                toast.classList.add('show');
+                setTimeout(() => {
+                    toast.classList.remove('show');
+                    el.classList.remove('copied');
+                }, 2000);
+            });
+        }
+
+        // At most one tag tooltip is open. The outside-click listener that
+        // closes it is only installed while it is open.
+        let openTooltip = null;
+
+        function closeTooltip() {
+            if (!openTooltip) return;
+            openTooltip.classList.remove('show');
+            openTooltip = null;
+            document.removeEventListener('click', closeTooltipOnOutsideClick, true);
+        }
+
+        function closeTooltipOnOutsideClick(e) {
+            // Clicks on a '+N' badge are handled by toggleTags itself
+            if (e.target.classList.contains('more') || e.target.closest('.tags-tooltip')) return;
+            closeTooltip();
+        }
+
+        function toggleTags(el) {
+            const tooltip = el.parentElement.querySelector('.tags-tooltip');
+            if (!tooltip) return;
+            const wasOpen = tooltip === openTooltip;
+            closeTooltip();
+            if (!wasOpen) {
+                tooltip.classList.add('show');
+                openTooltip = tooltip;
+                document.addEventListener('click', closeTooltipOnOutsideClick, true);
+            }
+        }
+
+        // The formatter embeds the full CSV export (same columns as
+        // awsmap -f csv) in #csv-full, one record per row in report order:
+        // records[0] is the header and ROWS[i] is records[i + 1].
+        let csvRecords = null;
+
+        function csvBytes() {
+            const href = document.getElementById('csv-full').getAttribute('href');
+            const bin = atob(href.substring(href.indexOf(',') + 1));
+            const bytes = new Uint8Array(bin.length);
+            for (let i = 0, n = bin.length; i < n; i++) bytes[i] = bin.charCodeAt(i);
+            return bytes;
+        }
+
+        // Split CSV text into records, keeping line breaks inside quoted fields
+        function splitRecords(text) {
+            const records = [];
+            let start = 0, quoted = false;
+            for (let i = 0, n = text.length; i < n; i++) {
+                const c = text.charCodeAt(i);
+                if (c === 34) {
+                    quoted = !quoted;
+                } else if (c === 10 && !quoted) {
+                    records.push(text.substring(start, i + 1));
+                    start = i + 1;
+                }
+            }
+            return records;
+        }
+
+        function exportCSV() {
+            let parts;
+            if (visibleTotal === ROWS.length) {
+                // Nothing filtered out: the embedded export as is
+                parts = [csvBytes()];
+            } else {
+                if (!csvRecords) csvRecords = splitRecords(new TextDecoder().decode(csvBytes()));
+                parts = [csvRecords[0]];
+                for (let i = 0, n = ROWS.length; i < n; i++) {
+                    if (ROWS[i].visible) parts.push(csvRecords[i + 1]);
+                }
+            }
+
+            const blob = new Blob(parts, {type: 'text/csv'});
+            const url = URL.createObjectURL(blob);
+            const a = document.createElement('a');
+            a.href = url;
+            a.download = 'aws-inventory.csv';
+            a.click();
+            URL.revokeObjectURL(url);
+        }
+
+        // Every click action in the report is declared with data-act and
+        // dispatched from this one listener. The innermost action wins, so
+        // copying an ID or opening the tag list never toggles the row.
+        const ACTIONS = {
+            toggleTheme: toggleTheme,
+            clearFilters: clearFilters,
+            expandAll: expandAll,
+            collapseAll: collapseAll,
+            exportCSV: exportCSV,
+            print: () => window.print(),
+            toggleSection: toggleSection,
+            toggleDetails: toggleDetails,
+            copy: copyToClipboard,
+            toggleTags: toggleTags
+        };
+        document.addEventListener('click', e => {
+            const el = e.target.closest('[data-act]');
+            if (el) ACTIONS[el.dataset.act](el);
+        });
+
+        document.getElementById('searchBox').addEventListener('input', debouncedFilter);
+        ['serviceFilter', 'regionFilter', 'tagFilter'].forEach(id =>
+            document.getElementById(id).addEventListener('change', filterResources));
+    </script>
+</body>
+</html>'''
+
+
+# Dynamic report sections, formatted per report
+_HEADER_TMPL = '''        <header>
             <h1>AWS Inventory Report</h1>
             <div class="subtitle">Comprehensive AWS Asset Discovery</div>
             <div class="meta-info">
-                <span class="meta-item">Account: {esc(account_id)}</span>
-                <span class="meta-item">Generated: {esc(timestamp)}</span>
-                <span class="meta-item">Duration: {duration}s</span>
+                <span class="meta-item">Account: %s</span>
+                <span class="meta-item">Generated: %s</span>
+                <span class="meta-item">Duration: %ss</span>
             </div>
         </header>
 
-        <div class="stats-grid">
+'''
+
+_STATS_TMPL = '''        <div class="stats-grid">
             <div class="stat-card">
-                <div class="number" id="stat-total">{total_resources:,}</div>
+                <div class="number" id="stat-total">%s</div>
                 <div class="label">Total Resources</div>
             </div>
             <div class="stat-card">
-                <div class="number" id="stat-services">{len(services)}</div>
+                <div class="number" id="stat-services">%d</div>
                 <div class="label">Services</div>
             </div>
             <div class="stat-card">
-                <div class="number" id="stat-regions">{len(regions)}</div>
+                <div class="number" id="stat-regions">%d</div>
                 <div class="label">Regions</div>
             </div>
             <div class="stat-card">
-                <div class="number" id="stat-types">{len(resource_types)}</div>
+                <div class="number" id="stat-types">%d</div>
                 <div class="label">Resource Types</div>
             </div>
         </div>
@@ -910,324 +1487,423 @@ def format_html(data: Dict[str, Any]) -> str:
         <div class="charts-row">
             <div class="chart-card">
                 <h3>Top Services</h3>
-                <div id="chart-services">{service_stats}</div>
+                <div id="chart-services">%s</div>
             </div>
             <div class="chart-card">
                 <h3>Top Regions</h3>
-                <div id="chart-regions">{region_stats}</div>
+                <div id="chart-regions">%s</div>
             </div>
         </div>
 
-        <div class="controls">
+'''
+
+_STAT_BAR_TMPL = (
+    '<div class="stat-bar"><span class="stat-label">%s</span><div class="%s" style="width: %d%%"></div>'
+    '<span class="stat-value">%d</span></div>'
+)
+
+_CONTROLS_TMPL = '''        <div class="controls">
             <div class="controls-row">
-                <input type="text" class="search-box" id="searchBox" placeholder="Search resources..." onkeyup="debouncedFilter()">
-                <select class="filter-select" id="serviceFilter" onchange="filterResources()">
+                <input type="text" class="search-box" id="searchBox" placeholder="Search resources...">
+                <select class="filter-select" id="serviceFilter">
                     <option value="">All Services</option>
-                    {service_options}
+                    %s
                 </select>
-                <select class="filter-select" id="regionFilter" onchange="filterResources()">
+                <select class="filter-select" id="regionFilter">
                     <option value="">All Regions</option>
-                    {region_options}
+                    %s
                 </select>
-                <select class="filter-select" id="tagFilter" onchange="filterResources()">
+                <select class="filter-select" id="tagFilter">
                     <option value="">All Tags</option>
-                    {tag_options_html}
+                    %s
                 </select>
-                <button class="btn btn-secondary" onclick="clearFilters()">Clear</button>
-                <button class="btn btn-secondary" onclick="expandAll()">Expand All</button>
-                <button class="btn btn-secondary" onclick="collapseAll()">Collapse All</button>
+                <button class="btn btn-secondary" data-act="clearFilters">Clear</button>
+                <button class="btn btn-secondary" data-act="expandAll">Expand All</button>
+                <button class="btn btn-secondary" data-act="collapseAll">Collapse All</button>
             </div>
             <div class="export-btns">
-                <button class="btn btn-primary" onclick="exportCSV()">Export CSV</button>
-                <button class="btn btn-primary" onclick="window.print()">Print</button>
+                <button class="btn btn-primary" data-act="exportCSV">Export CSV</button>
+                <button class="btn btn-primary" data-act="print">Print</button>
             </div>
         </div>
 
-        <div id="services-container">
-            {''.join(service_sections)}
-        </div>
+'''
+
+_SERVICES_OPEN = '''        <div id="services-container">
+            '''
+
+_SERVICES_CLOSE = '''
+        </div>'''
+
+# Initial dashboard counts, so the report script starts from the same numbers
+# the page was rendered with instead of recounting every row
+_DASH_DATA_TMPL = '''
+        <script>window.__INITIAL_DASH__ = %s;</script>'''
+
+# Full CSV export in report order, written as a base64 data URL between these
+_CSV_LINK_OPEN = '\n        <a id="csv-full" href="data:text/csv;charset=utf-8;base64,'
+_CSV_LINK_CLOSE = '" download="aws-inventory.csv" hidden></a>'
+
+# Above this many resources each section's rows are shipped inside an inert
+# <template>. The browser then builds no live table rows at load; the report
+# script moves a section's rows into its table the first time it is shown.
+_LAZY_ROWS_THRESHOLD = 2000
+
+# Region badge colors, keyed on the region prefix ("us" for "us-east-1")
+_REGION_BADGE_CLASS = {
+    prefix: f'region-badge r-{prefix}'
+    for prefix in ('us', 'eu', 'ap', 'sa', 'ca', 'af', 'me', 'global')
+}
+
+# Per-resource and per-service HTML fragments (%-formatted with escaped values)
+_ROW_TMPL = '''
+                <tr data-service="%s" data-region="%s"%s>
+                    <td>%s%s</td>
+                    <td>%s</td>
+                    <td class="resource-id" title="Click to copy ARN" data-act="copy">%s</td>
+                    <td><span class="%s">%s</span></td>
+                    <td class="tags-cell">%s%s</td>
+                </tr>
+            '''
 
-        <footer>
-            <div class="footer-logo">awsmap</div>
-        </footer>
-    </div>
+_DETAIL_ROW_TMPL = '''
+                <tr class="details-row collapsed">
+                    <td colspan="%d">
+                        <div class="details-panel">
+                            <div class="details-grid">%s</div>
+                        </div>
+                    </td>
+                </tr>
+            '''
 
-    <div class="toast" id="toast">Copied!</div>
+_SERVICE_SECTION_OPEN_TMPL = '''
+            <div class="service-section" data-service="%s">
+                <div class="service-header" data-act="toggleSection">
+                    <span class="service-name">%s</span>
+                    <span class="service-count">%d resource%s</span>
+                    <span class="toggle-icon">+</span>
+                </div>
+                <div class="service-content collapsed">
+                    <table>
+                        <thead>
+                            <tr>
+                                <th>Type</th>
+                                <th>Name</th>
+                                <th>ID / ARN</th>
+                                <th>Region</th>
+                                <th>Tags</th>
+                            </tr>
+                        </thead>
+                        <tbody>
+                            '''
 
-    <script>
-        function toggleTheme() {{
-            document.body.classList.toggle('dark');
-            const icon = document.getElementById('theme-icon');
-            icon.innerHTML = document.body.classList.contains('dark') ? '&#x2600;' : '&#x1F319;';
-            localStorage.setItem('theme', document.body.classList.contains('dark') ? 'dark' : 'light');
-        }}
-
-        if (localStorage.getItem('theme') === 'dark') {{
-            document.body.classList.add('dark');
-            document.getElementById('theme-icon').innerHTML = '&#x2600;';
-        }}
+# Wrapper for a section's rows in large reports (see _LAZY_ROWS_THRESHOLD)
+_ROWS_TEMPLATE_OPEN = '<template class="rows-tpl">'
+_ROWS_TEMPLATE_CLOSE = '</template>'
 
-        function highlightMatches(element, term, selector) {{
-            clearHighlights(element);
-            if (!term) return;
-            element.querySelectorAll(selector || '.detail-value').forEach(node => {{
-                const walker = document.createTreeWalker(node, NodeFilter.SHOW_TEXT);
-                const textNodes = [];
-                while (walker.nextNode()) textNodes.push(walker.currentNode);
-                textNodes.forEach(textNode => {{
-                    const text = textNode.nodeValue;
-                    const lower = text.toLowerCase();
-                    const termLower = term.toLowerCase();
-                    const frag = document.createDocumentFragment();
-                    let lastIdx = 0, idx, found = false;
-                    while ((idx = lower.indexOf(termLower, lastIdx)) !== -1) {{
-                        found = true;
-                        if (idx > lastIdx) frag.appendChild(document.createTextNode(text.substring(lastIdx, idx)));
-                        const mark = document.createElement('mark');
-                        mark.textContent = text.substring(idx, idx + term.length);
-                        frag.appendChild(mark);
-                        lastIdx = idx + term.length;
-                    }}
-                    if (!found) return;
-                    if (lastIdx < text.length) frag.appendChild(document.createTextNode(text.substring(lastIdx)));
-                    textNode.parentNode.replaceChild(frag, textNode);
-                }});
-            }});
-        }}
-
-        function clearHighlights(element) {{
-            element.querySelectorAll('mark').forEach(mark => {{
-                const parent = mark.parentNode;
-                parent.replaceChild(document.createTextNode(mark.textContent), mark);
-                parent.normalize();
-            }});
-        }}
-
-        let debounceTimer;
-        function debouncedFilter() {{
-            clearTimeout(debounceTimer);
-            debounceTimer = setTimeout(filterResources, 300);
-        }}
-
-        function toggleSection(header) {{
-            const content = header.nextElementSibling;
-            const icon = header.querySelector('.toggle-icon');
-            content.classList.toggle('collapsed');
-            icon.textContent = content.classList.contains('collapsed') ? '+' : '-';
-        }}
-
-        function expandAll() {{
-            document.querySelectorAll('.service-content').forEach(c => c.classList.remove('collapsed'));
-            document.querySelectorAll('.toggle-icon').forEach(i => i.textContent = '-');
-            document.querySelectorAll('.details-row').forEach(r => r.classList.remove('collapsed'));
-            document.querySelectorAll('tr[data-has-details]').forEach(r => r.classList.add('expanded'));
-        }}
-
-        function collapseAll() {{
-            document.querySelectorAll('.service-content').forEach(c => c.classList.add('collapsed'));
-            document.querySelectorAll('.toggle-icon').forEach(i => i.textContent = '+');
-            document.querySelectorAll('.details-row').forEach(r => r.classList.add('collapsed'));
-            document.querySelectorAll('tr[data-has-details]').forEach(r => r.classList.remove('expanded'));
-        }}
-
-        function toggleDetails(row) {{
-            const detailRow = row.nextElementSibling;
-            if (detailRow && detailRow.classList.contains('details-row')) {{
-                detailRow.classList.toggle('collapsed');
-                row.classList.toggle('expanded');
-            }}
-        }}
-
-        function updateDashboard() {{
-            const visibleRows = document.querySelectorAll('tbody tr:not(.hidden):not(.details-row)');
-            const serviceCounts = {{}};
-            const regionCounts = {{}};
-            const typeCounts = {{}};
-
-            visibleRows.forEach(row => {{
-                const svc = row.dataset.service;
-                const reg = row.dataset.region;
-                const type = row.querySelector('td:first-child');
-                const key = svc + '/' + (type ? type.textContent : '');
-                serviceCounts[svc] = (serviceCounts[svc] || 0) + 1;
-                regionCounts[reg] = (regionCounts[reg] || 0) + 1;
-                typeCounts[key] = (typeCounts[key] || 0) + 1;
-            }});
-
-            const total = visibleRows.length;
-            document.getElementById('stat-total').textContent = total.toLocaleString();
-            document.getElementById('stat-services').textContent = Object.keys(serviceCounts).length;
-            document.getElementById('stat-regions').textContent = Object.keys(regionCounts).length;
-            document.getElementById('stat-types').textContent = Object.keys(typeCounts).length;
-
-            const topServices = Object.entries(serviceCounts).sort((a, b) => b[1] - a[1]).slice(0, 5);
-            document.getElementById('chart-services').innerHTML = topServices.map(([svc, count]) =>
-                '<div class="stat-bar"><span class="stat-label">' + svc.toUpperCase() + '</span><div class="bar" style="width: ' + Math.min(100, Math.round(count * 100 / Math.max(1, total))) + '%"></div><span class="stat-value">' + count + '</span></div>'
-            ).join('');
-
-            const topRegions = Object.entries(regionCounts).sort((a, b) => b[1] - a[1]).slice(0, 5);
-            document.getElementById('chart-regions').innerHTML = topRegions.map(([reg, count]) =>
-                '<div class="stat-bar"><span class="stat-label">' + reg + '</span><div class="bar region-bar" style="width: ' + Math.min(100, Math.round(count * 100 / Math.max(1, total))) + '%"></div><span class="stat-value">' + count + '</span></div>'
-            ).join('');
-        }}
-
-        function filterResources() {{
-            const search = document.getElementById('searchBox').value.toLowerCase();
-            const service = document.getElementById('serviceFilter').value;
-            const region = document.getElementById('regionFilter').value;
-            const tag = document.getElementById('tagFilter').value;
+# Closes a section and carries its rows' search index for the report script
+# ("<" is escaped so the payload can never close the script element)
+_SERVICE_SECTION_CLOSE_TMPL = '''
+                        </tbody>
+                    </table>
+                </div>
+                <script class="rows-data" type="application/json">%s</script>
+            </div>
+        '''
 
-            document.querySelectorAll('.service-section').forEach(section => {{
-                const sectionService = section.dataset.service;
-                if (service && sectionService !== service) {{
-                    section.classList.add('hidden');
-                    return;
-                }}
 
-                let visibleCount = 0;
-                section.querySelectorAll('tbody tr:not(.details-row)').forEach(row => {{
-                    const rowService = row.dataset.service;
-                    const rowRegion = row.dataset.region;
-                    const rowName = row.dataset.name;
-                    const rowId = row.dataset.id;
-                    const rowTags = row.dataset.tags || '';
-
-                    const matchService = !service || rowService === service;
-                    const matchRegion = !region || rowRegion === region;
-                    const detailText = row.dataset.details || '';
-                    const matchSearch = !search || rowName.includes(search) || rowId.includes(search) || detailText.includes(search);
-                    const matchTag = !tag || rowTags.split('|').includes(tag);
-
-                    const matchedInName = search && (rowName.includes(search) || rowId.includes(search));
-                    const matchedInDetails = search && detailText.includes(search);
-
-                    if (matchService && matchRegion && matchSearch && matchTag) {{
-                        row.classList.remove('hidden');
-                        visibleCount++;
-                        if (search) {{
-                            highlightMatches(row, search, 'td:nth-child(-n+3)');
-                        }} else {{
-                            clearHighlights(row);
-                        }}
-                        const detailRow = row.nextElementSibling;
-                        if (detailRow && detailRow.classList.contains('details-row')) {{
-                            detailRow.classList.remove('hidden');
-                            if (matchedInDetails) {{
-                                detailRow.classList.remove('collapsed');
-                                row.classList.add('expanded');
-                                row.dataset.autoExpanded = 'true';
-                                highlightMatches(detailRow, search);
-                            }} else if (row.dataset.autoExpanded) {{
-                                detailRow.classList.add('collapsed');
-                                row.classList.remove('expanded');
-                                delete row.dataset.autoExpanded;
-                                clearHighlights(detailRow);
-                            }}
-                        }}
-                    }} else {{
-                        row.classList.add('hidden');
-                        clearHighlights(row);
-                        const detailRow = row.nextElementSibling;
-                        if (detailRow && detailRow.classList.contains('details-row')) {{
-                            detailRow.classList.add('hidden');
-                            clearHighlights(detailRow);
-                        }}
-                        if (row.dataset.autoExpanded) {{
-                            delete row.dataset.autoExpanded;
-                        }}
-                    }}
-                }});
-
-                const hasVisible = visibleCount > 0;
-                section.classList.toggle('hidden', !hasVisible);
-
-                const countEl = section.querySelector('.service-count');
-                if (countEl) {{
-                    countEl.textContent = visibleCount + ' resource' + (visibleCount !== 1 ? 's' : '');
-                }}
-
-                const content = section.querySelector('.service-content');
-                const icon = section.querySelector('.toggle-icon');
-                if (hasVisible && search) {{
-                    content.classList.remove('collapsed');
-                    if (icon) icon.textContent = '-';
-                    section.dataset.autoExpanded = 'true';
-                }} else if (!search && section.dataset.autoExpanded) {{
-                    content.classList.add('collapsed');
-                    if (icon) icon.textContent = '+';
-                    delete section.dataset.autoExpanded;
-                }}
-            }});
-
-            updateDashboard();
-        }}
-
-        function clearFilters() {{
-            document.getElementById('searchBox').value = '';
-            document.getElementById('serviceFilter').value = '';
-            document.getElementById('regionFilter').value = '';
-            document.getElementById('tagFilter').value = '';
-            filterResources();
-        }}
+_DETAIL_ITEM_TMPL = '<div class="detail-item"><span class="detail-key">%s</span>%s</div>'
 
-        function copyToClipboard(el) {{
-            navigator.clipboard.writeText(el.textContent.trim()).then(() => {{
-                el.classList.add('copied');
-                const toast = document.getElementById('toast');
-                toast.classList.add('show');
-                setTimeout(() => {{
-                    toast.classList.remove('show');
-                    el.classList.remove('copied');
-                }}, 2000);
-            }});
-        }}
 
-        function toggleTags(el) {{
-            event.stopPropagation();
-            const tooltip = el.parentElement.querySelector('.tags-tooltip');
-            if (tooltip) {{
-                // Close any other open tooltips
-                document.querySelectorAll('.tags-tooltip.show').forEach(t => {{
-                    if (t !== tooltip) t.classList.remove('show');
-                }});
-                tooltip.classList.toggle('show');
-            }}
-        }}
-
-        // Close tooltips when clicking outside
-        document.addEventListener('click', function(e) {{
-            if (!e.target.classList.contains('more') && !e.target.closest('.tags-tooltip')) {{
-                document.querySelectorAll('.tags-tooltip.show').forEach(t => t.classList.remove('show'));
-            }}
-        }});
-
-        function exportCSV() {{
-            let csv = 'Service,Type,Name,ID/ARN,Region\\n';
-            document.querySelectorAll('tbody tr:not(.hidden):not(.details-row)').forEach(row => {{
-                const cells = row.querySelectorAll('td');
-                const data = [
-                    row.dataset.service,
-                    cells[0].textContent,
-                    cells[1].textContent,
-                    cells[2].textContent,
-                    row.dataset.region
-                ].map(s => '"' + s.replace(/"/g, '""') + '"');
-                csv += data.join(',') + '\\n';
-            }});
-
-            const blob = new Blob([csv], {{type: 'text/csv'}});
-            const url = URL.createObjectURL(blob);
-            const a = document.createElement('a');
-            a.href = url;
-            a.download = 'aws-inventory.csv';
-            a.click();
-            URL.revokeObjectURL(url);
-        }}
-    </script>
-</body>
-</html>'''
+def _format_detail_value(value: Any) -> str:
+    """Render a resource detail value as an HTML span."""
+    if value is None:
+        return '<span class="detail-value null-value">&mdash;</span>'
+    if isinstance(value, bool):
+        cls = 'bool-true' if value else 'bool-false'
+        text = 'Yes' if value else 'No'
+        return f'<span class="detail-value {cls}">{text}</span>'
+    if isinstance(value, list):
+        if not value:
+            return '<span class="detail-value null-value">&mdash;</span>'
+        items = ''.join(f'<span class="detail-list-item">{_esc(str(item))}</span>' for item in value)
+        return f'<span class="detail-value"><span class="detail-list">{items}</span></span>'
+    if isinstance(value, dict):
+        # Sorted keys keep reports of the same account diffable
+        return f'<span class="detail-value">{_esc(_json_dumps(value, sort_keys=True))}</span>'
+    return f'<span class="detail-value">{_esc(str(value))}</span>'
+
+
+def _format_detail_key(key: str) -> str:
+    """Render a detail key for display: snake_case -> Title Case."""
+    return key.replace('_', ' ').title()
+
+
+def _tag_strings(tags: Dict[str, Any], esc: Callable[[Any], str] = _esc) -> Tuple[List[str], str, str]:
+    """
+    Render a resource's tags for its report row in a single pass.
+
+    Each "key=value" token is built and escaped once, then shared by the
+    row's search index entry, the inline badges and the overflow tooltip.
+
+    Args:
+        tags: Resource tags
+        esc: HTML escape function
+
+    Returns:
+        Tuple of (raw "key=value" tokens, badges HTML, tooltip HTML)
+    """
+    if not tags:
+        return [], '', ''
+
+    # A missing value renders as "Key=", the same as the tag filter options
+    pairs = [f"{k}={'' if v is None else v}" for k, v in tags.items()]
+    spans = [f'<span class="tag">{esc(kv)}</span>' for kv in pairs]
+    badges = ''.join(spans[:3])
+    tooltip = ''
+    if len(spans) > 3:
+        badges += f'<span class="tag more" data-act="toggleTags">+{len(spans)-3}</span>'
+        tooltip = '<div class="tags-tooltip">' + ''.join(spans) + '</div>'
+
+    return pairs, badges, tooltip
+
+
+def _iter_service_sections(services: Dict[str, List[Dict[str, Any]]],
+                           include_detail_search: bool = True,
+                           lazy_rows: bool = False) -> Iterator[str]:
+    """
+    Render the report's service sections (tables of resources).
+
+    Each section ends with its rows' search index: one JSON array per row,
+    in document order: [name, id, tag tokens(, details)], with name, id and
+    details lowercased.
+
+    Args:
+        services: Resources grouped by service name
+        include_detail_search: Include the searchable detail summary per row
+        lazy_rows: Wrap each section's rows in a <template>
+
+    Yields:
+        HTML for one service section at a time
+    """
+    num_columns = 5  # Type, Name, ID/ARN, Region, Tags
+    parts: List[str] = []
+    parts_append = parts.append
+    row_index: List[tuple] = []
+
+    # Row emitter, built once per report. Everything the loop body touches is
+    # bound as a default argument so lookups are locals rather than globals.
+    def _emit_row(r, svc_esc, _e=_esc, _append=parts_append, _row_tmpl=_ROW_TMPL,
+                  _detail_row_tmpl=_DETAIL_ROW_TMPL, _detail_item_tmpl=_DETAIL_ITEM_TMPL,
+                  _ctrl=_CTRL_TRANS, _badge_cls=_REGION_BADGE_CLASS,
+                  _fmt_key=_format_detail_key, _fmt_value=_format_detail_value, _tags=_tag_strings,
+                  _detail_search=include_detail_search, _num_columns=num_columns,
+                  _index_append=row_index.append):
+        # Read every field once up front
+        g = r.get
+        rtype, rid, name, arn, region_val, is_default, tags, details = (
+            g('type', ''), g('id', ''), g('name', ''), g('arn', ''),
+            g('region', 'global') or 'global', g('is_default'),
+            g('tags', {}), g('details', {}),
+        )
+
+        tag_pairs, tag_badges, all_tags_html = _tags(tags, _e)
+
+        # Search index entry; the client matches against these instead of
+        # reading row attributes on every keystroke. Emitted as a JSON array,
+        # so the field names are not repeated for every row.
+        if details and _detail_search:
+            _index_append((
+                str(name).lower(), str(rid).lower(), tag_pairs,
+                ' '.join(str(v) for v in details.values()).lower().translate(_ctrl),
+            ))
+        else:
+            _index_append((str(name).lower(), str(rid).lower(), tag_pairs))
+
+        # Main resource row
+        detail_attrs = ' data-has-details="true" data-act="toggleDetails"' if details else ''
+
+        default_badge = '<span class="default-badge">DEFAULT</span>' if is_default else ''
+
+        _append(_row_tmpl % (
+            svc_esc, _e(region_val), detail_attrs,
+            _e(rtype), default_badge,
+            _e(name or rid),
+            _e(arn or rid),
+            _badge_cls.get(str(region_val).split('-', 1)[0], 'region-badge'), _e(region_val),
+            tag_badges, all_tags_html,
+        ))
+
+        # Detail row (hidden by default)
+        if details:
+            detail_items = ''.join(
+                _detail_item_tmpl % (_e(_fmt_key(k)), _fmt_value(v))
+                for k, v in details.items()
+            )
+            _append(_detail_row_tmpl % (_num_columns, detail_items))
+
+    for service_name in sorted(services.keys()):
+        service_resources = services[service_name]
+        count = len(service_resources)
+
+        svc_esc = _esc(service_name)
+
+        parts_append(_SERVICE_SECTION_OPEN_TMPL % (
+            svc_esc, _esc(service_name.upper()),
+            count, 's' if count != 1 else '',
+        ))
+
+        if lazy_rows:
+            parts_append(_ROWS_TEMPLATE_OPEN)
+        for r in service_resources:
+            _emit_row(r, svc_esc)
+        if lazy_rows:
+            parts_append(_ROWS_TEMPLATE_CLOSE)
 
-    return html
+        parts_append(_SERVICE_SECTION_CLOSE_TMPL % _json_dumps(row_index).replace('<', '\\u003c'))
+
+        yield ''.join(parts)
+        parts.clear()
+        row_index.clear()
+
+
+def format_html_stream(data: Dict[str, Any], out: TextIO,
+                       include_detail_search: bool = True) -> None:
+    """
+    Write inventory data as an HTML report to a text stream.
+
+    The report is written one service section at a time, so the full
+    document never has to be held in memory.
+
+    Args:
+        data: Inventory data with metadata and resources
+        out: Text stream to write to
+        include_detail_search: Embed a searchable summary of each resource's
+            details so the report's search box also matches detail values.
+            Disabling it makes large reports noticeably smaller.
+    """
+    resources = data.get('resources', [])
+    metadata = data.get('metadata', {})
+
+    m = metadata.get
+    account_id, timestamp, duration = (
+        m('account_id', 'Unknown'), m('timestamp', ''), m('scan_duration_seconds', 0),
+    )
+    total_resources = len(resources)
+
+    # Group by service, count regions and resource types, and collect all
+    # unique tags in a single pass. Aggregation keys are interned since the
+    # same few strings repeat across every resource; the resource dicts
+    # themselves are left untouched.
+    intern = _intern
+    services = defaultdict(list)
+    regions: 'Counter[Any]' = Counter()
+    all_tags = defaultdict(set)
+    resource_types: 'Counter[str]' = Counter()
+    for r in resources:
+        svc = intern(r.get('service', 'unknown'))
+        services[svc].append(r)
+
+        reg = intern(r.get('region', 'global') or 'global')
+        regions[reg] += 1
+
+        # Keyed like the report's type cells, which render None as empty
+        rtype = r.get('type', '')
+        resource_types[f"{svc}/{'' if rtype is None else rtype}"] += 1
+
+        for k, v in r.get('tags', {}).items():
+            # None values match the "Key=" tokens in the search index
+            all_tags[intern(k)].add('' if v is None else v)
+
+    # Build service options
+    service_options = '\n'.join(
+        f'<option value="{_esc(s)}">{_esc(s.upper())}</option>'
+        for s in sorted(services.keys())
+    )
+
+    # Build region options. Options are sorted by their text so that
+    # non-str regions and tags sort alongside the rest.
+    region_options = '\n'.join(
+        f'<option value="{_esc(r)}">{_esc(r)}</option>'
+        for r in sorted(regions.keys(), key=str)
+    )
+
+    # Build tag options (Key=Value format)
+    tag_pairs = sorted(
+        ((k, v) for k, vs in all_tags.items() for v in vs),
+        key=lambda kv: (str(kv[0]), str(kv[1])),
+    )
+    tag_options_html = '\n'.join(
+        f'<option value="{kv}">{kv}</option>'
+        for kv in (f'{_esc(k)}={_esc(v)}' for k, v in tag_pairs)
+    )
+
+    # Build stats cards. Largest first with ties by name, the same order the
+    # report script uses when it redraws the charts.
+    def by_count(item):
+        return -item[1], str(item[0])
+
+    service_counts = sorted(((s, len(r)) for s, r in services.items()), key=by_count)
+    region_counts = sorted(regions.items(), key=by_count)
+
+    top_services = service_counts[:5]
+    service_stats = ''.join(
+        _STAT_BAR_TMPL % (_esc(s.upper()), 'bar', min(100, count*100//max(1, total_resources)), count)
+        for s, count in top_services
+    )
+
+    # Build region stats
+    top_regions = region_counts[:5]
+    region_stats = ''.join(
+        _STAT_BAR_TMPL % (_esc(reg), 'bar region-bar', min(100, count*100//max(1, total_resources)), count)
+        for reg, count in top_regions
+    )
+
+    write = out.write
+    write(_HTML_DOC_START_TMPL % _esc(account_id))
+    write(_HTML_HEAD)
+    write(_HEADER_TMPL % (_esc(account_id), _esc(timestamp), duration))
+    write(_STATS_TMPL % (
+        f'{total_resources:,}', len(services), len(regions), len(resource_types),
+        service_stats, region_stats,
+    ))
+    write(_CONTROLS_TMPL % (service_options, region_options, tag_options_html))
+    write(_SERVICES_OPEN)
+    out.writelines(_iter_service_sections(
+        services, include_detail_search,
+        lazy_rows=total_resources > _LAZY_ROWS_THRESHOLD,
+    ))
+    write(_SERVICES_CLOSE)
+    write(_DASH_DATA_TMPL % _json_dumps({
+        'services': service_counts, 'regions': region_counts,
+        'types': list(resource_types.items()), 'total': total_resources,
+    }).replace('<', '\\u003c'))
+
+    # Same rows as format_csv, ordered like the report so the export script
+    # can pick the visible ones by position
+    ordered = [r for s in sorted(services.keys()) for r in services[s]]
+    write(_CSV_LINK_OPEN)
+    out.writelines(_iter_base64(iter_format_csv({'resources': ordered})))
+    write(_CSV_LINK_CLOSE)
+    write(_HTML_TAIL)
+
+
+def format_html(data: Dict[str, Any], include_detail_search: bool = True) -> str:
+    """
+    Format inventory data as beautiful HTML report.
+
+    Args:
+        data: Inventory data with metadata and resources
+        include_detail_search: Embed a searchable summary of each resource's
+            details so the report's search box also matches detail values.
+            Disabling it makes large reports noticeably smaller.
+
+    Returns:
+        HTML string
+    """
+    buf = io.StringIO()
+    format_html_stream(data, buf, include_detail_search)
+    return buf.getvalue()
 
 
 def format_output(data: Dict[str, Any], format_type: str) -> str:
@@ -1256,6 +1932,91 @@ def format_output(data: Dict[str, Any], format_type: str) -> str:
         raise ValueError(f"Unsupported format: {format_type}")
 
 
+@contextmanager
+def _open_output(file_path: str, newline: Optional[str] = None) -> Iterator[TextIO]:
+    """
+    Open file_path for streaming output into it.
+
+    An existing regular file is written through a temporary file next to
+    it, which takes over its mode and only replaces it once the body has
+    finished, so a formatting error keeps the previous report. A file
+    created here is removed again on error. Anything else (symlinks, hard
+    links, devices, pipes, unwritable directories) is written in place.
+
+    Args:
+        file_path: Destination file path
+        newline: Passed through to open()
+
+    Yields:
+        Text file object to write to
+    """
+    try:
+        st: Optional[os.stat_result] = os.lstat(file_path)
+    except OSError:
+        st = None
+
+    if st is not None and stat.S_ISREG(st.st_mode) and st.st_nlink == 1:
+        try:
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(file_path)), prefix='.awsmap-', suffix='.tmp',
+            )
+        except OSError:
+            pass  # fall through and write in place
+        else:
+            try:
+                with open(fd, 'w', encoding='utf-8', newline=newline) as f:
+                    yield f
+                shutil.copymode(file_path, tmp_path)
+                os.replace(tmp_path, file_path)
+            except BaseException:
+                with suppress(OSError):
+                    os.unlink(tmp_path)
+                raise
+            return
+
+    try:
+        with open(file_path, 'w', encoding='utf-8', newline=newline) as f:
+            yield f
+    except BaseException:
+        if st is None:
+            with suppress(OSError):
+                os.unlink(file_path)
+        raise
+
+
+def write_output(data: Dict[str, Any], format_type: str, file_path: str,
+                 include_detail_search: bool = True) -> None:
+    """
+    Format inventory data and write it to a file.
+
+    CSV and HTML output are streamed to the file instead of being built
+    in memory first; a formatting error leaves an existing report in
+    place and removes a newly created one.
+
+    Args:
+        data: Inventory data with metadata and resources
+        format_type: Output format (json, csv, html)
+        file_path: Destination file path
+        include_detail_search: Make resource details searchable in HTML
+            reports (see format_html)
+
+    Raises:
+        ValueError: If format type is not supported
+    """
+    format_type = format_type.lower()
+
+    if format_type == 'csv':
+        with _open_output(file_path, newline='') as f:
+            format_csv_stream(data, f)
+        return
+    if format_type == 'html':
+        with _open_output(file_path) as f:
+            format_html_stream(data, f, include_detail_search)
+        return
+
+    export_file(format_output(data, format_type), file_path)
+
+
 def export_file(content: str, file_path: str) -> None:
     """
     Export content to a file.
@@ -0,0 +1,160 @@
+"""
+Tests for the output formatters.
+"""
+
+import io
+import json
+import re
+
+import pytest
+
+from aws_inventory import formatter
+from aws_inventory.formatter import (
+    format_csv,
+    format_csv_stream,
+    format_html,
+    format_html_stream,
+    format_json,
+    format_output,
+    iter_format_csv,
+    write_output,
+)
+
+
+@pytest.fixture
+def inventory():
+    return {
+        'metadata': {
+            'account_id': '123456789012',
+            'timestamp': '2026-01-01T00:00:00',
+            'scan_duration_seconds': 1.5,
+            'resource_count': 3,
+        },
+        'resources': [
+            {
+                'service': 'ec2', 'type': 'vpc', 'id': 'vpc-1', 'name': 'default',
+                'region': 'us-east-1', 'arn': 'arn:aws:ec2:us-east-1::vpc/vpc-1',
+                'is_default': True, 'tags': {'Owner': None},
+                'details': {
+                    'cidr_block': '172.31.0.0/16', 'state': 'Available',
+                    'policy': {'b': 1, 'a': 2},
+                },
+            },
+            {
+                'service': 's3', 'type': 'bucket', 'id': 'logs', 'name': 'logs, "raw"',
+                'region': 'global', 'arn': 'arn:aws:s3:::logs',
+                'tags': {'Env': 'prod', 'Team': 'Données <ops>'},
+            },
+            {
+                'service': 'lambda', 'type': 'function', 'id': 'fn', 'name': 'fn',
+                'region': None, 'arn': '', 'tags': {}, 'details': {},
+            },
+        ],
+    }
+
+
+def _row_index(html):
+    """Concatenate the per-section search index entries of a report."""
+    rows = []
+    for payload in re.findall(r'<script class="rows-data" type="application/json">(.*?)</script>', html):
+        rows.extend(json.loads(payload))
+    return rows
+
+
+@pytest.mark.parametrize('resources', [True, False])
+def test_csv_formatters_agree(inventory, resources):
+    if not resources:
+        inventory['resources'] = []
+    buf = io.StringIO(newline='')
+    format_csv_stream(inventory, buf)
+
+    expected = format_csv(inventory)
+    assert ''.join(iter_format_csv(inventory)) == expected
+    assert buf.getvalue() == expected
+
+
+@pytest.mark.parametrize('include_detail_search', [True, False])
+def test_html_stream_matches_format_html(inventory, include_detail_search):
+    buf = io.StringIO()
+    format_html_stream(inventory, buf, include_detail_search)
+
+    assert buf.getvalue() == format_html(inventory, include_detail_search)
+
+
+@pytest.mark.parametrize('include_detail_search', [True, False])
+def test_detail_search_controls_index(inventory, tmp_path, include_detail_search):
+    path = tmp_path / 'inventory.html'
+    write_output(inventory, 'html', str(path), include_detail_search=include_detail_search)
+
+    entry = _row_index(path.read_text(encoding='utf-8'))[0]
+    if include_detail_search:
+        assert 'available' in entry[3]
+    else:
+        assert len(entry) == 3
+
+
+def test_none_tag_value_matches_filter_option(inventory):
+    html = format_html(inventory)
+
+    assert '<option value="Owner=">Owner=</option>' in html
+    assert _row_index(html)[0][:3] == ['default', 'vpc-1', ['Owner=']]
+    assert 'Owner=None' not in html
+
+
+def test_non_str_tag_keys_render(inventory):
+    inventory['resources'][1]['tags'] = {2024: 'year'}
+
+    assert '<option value="2024=year">' in format_html(inventory)
+
+
+def test_non_str_region_values_render(inventory):
+    inventory['resources'][1]['region'] = 7
+
+    html = format_html(inventory)
+    assert '<span class="region-badge">7</span>' in html
+    assert '<option value="7">7</option>' in html
+
+
+@pytest.mark.parametrize('format_type', ['json', 'csv', 'html'])
+def test_write_output_round_trip(inventory, tmp_path, format_type):
+    path = tmp_path / f'inventory.{format_type}'
+    write_output(inventory, format_type, str(path))
+
+    with open(path, encoding='utf-8', newline='') as f:
+        assert f.read() == format_output(inventory, format_type)
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_write_output_json_loads_back(inventory, tmp_path):
+    path = tmp_path / 'inventory.json'
+    write_output(inventory, 'json', str(path))
+
+    assert json.loads(path.read_text(encoding='utf-8')) == json.loads(format_json(inventory))
+
+
+class FormatterFailed(Exception):
+    pass
+
+
+def test_write_output_keeps_existing_file_on_error(inventory, tmp_path, monkeypatch):
+    def fail(data, out, *args):
+        out.write('partial report')
+        raise FormatterFailed
+
+    monkeypatch.setattr(formatter, 'format_html_stream', fail)
+    path = tmp_path / 'inventory.html'
+    path.write_text('previous report', encoding='utf-8')
+
+    with pytest.raises(FormatterFailed):
+        write_output(inventory, 'html', str(path))
+
+    assert path.read_text(encoding='utf-8') == 'previous report'
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_write_output_rejects_unknown_format(inventory, tmp_path):
+    path = tmp_path / 'inventory.xml'
+    with pytest.raises(ValueError):
+        write_output(inventory, 'xml', str(path))
+
+    assert not path.exists()